@@ -1,55 +1,100 @@
 import os
 import json
+import time
 import asyncio
 from datetime import datetime
 from zoneinfo import ZoneInfo
+from aiohttp import web
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
-    ApplicationBuilder, CommandHandler, CallbackQueryHandler,
+    ApplicationBuilder, AIORateLimiter, CommandHandler, CallbackQueryHandler,
     ContextTypes
 )
 
 # Importamos funciones ya existentes de tu scraper
 from dollar_scraper_advanced import (
-    scrape_all, build_summary_message, now_ba_str
+    scrape_all_async, close_aio_session, build_summary_message, now_ba_str
 )
 
 TZ_BA = ZoneInfo("America/Argentina/Buenos_Aires")
-SUBS_FILE = "subscribers.json"
+# Un chat_id por línea: alta = append de una línea; baja = reescritura atómica
+SUBS_FILE = "subscribers.txt"
+_LEGACY_SUBS_FILE = "subscribers.json"
 
-from flask import Flask
-import threading
-
-def keep_alive():
-    app = Flask(__name__)
-
-    @app.get("/")
-    def home():
-        return "Bot OK"
+# ---------------- Healthcheck para Render ---------------- #
+async def start_health_server(app):
+    """
+    Responde "Bot OK" en GET / para el healthcheck de Render, sobre el
+    mismo event loop del bot (sin Flask ni thread aparte).
+    """
+    async def home(request):
+        return web.Response(text="Bot OK")
 
+    web_app = web.Application()
+    web_app.router.add_get("/", home)
+    runner = web.AppRunner(web_app)
+    await runner.setup()
     # Render usa el puerto 10000 si está definido, sino 8080
-    import os
     port = int(os.getenv("PORT", "8080"))
-    app.run(host="0.0.0.0", port=port)
+    await web.TCPSite(runner, "0.0.0.0", port).start()
+    print(f"🌐 Healthcheck escuchando en :{port}")
 
-# Lanzamos el server en un thread para no bloquear el bot
-threading.Thread(target=keep_alive, daemon=True).start()
+async def close_http_session(app):
+    """Cierra la ClientSession compartida del scraper al apagar el bot."""
+    await close_aio_session()
 
 # ---------------- Persistencia de suscriptores ---------------- #
 def load_subs() -> set[int]:
     if os.path.exists(SUBS_FILE):
         try:
             with open(SUBS_FILE, "r", encoding="utf-8") as f:
-                return set(json.load(f))
+                return {int(line) for line in f if line.strip()}
+        except Exception:
+            return set()
+    # Migración desde el viejo subscribers.json
+    if os.path.exists(_LEGACY_SUBS_FILE):
+        try:
+            with open(_LEGACY_SUBS_FILE, "r", encoding="utf-8") as f:
+                subs = set(json.load(f))
         except Exception:
             return set()
+        # Compactamos ya al formato nuevo: si el primer alta pasara por el
+        # append de add_sub, los migrados nunca llegarían a subscribers.txt
+        save_subs(subs)
+        return subs
     return set()
 
+# Último snapshot persistido: si no cambió nada, save_subs no toca el disco
+_SUBS_SAVED: frozenset = frozenset()
+
 def save_subs(subs: set[int]) -> None:
-    with open(SUBS_FILE, "w", encoding="utf-8") as f:
-        json.dump(sorted(list(subs)), f)
+    """Reescritura completa (bajas / compactación), atómica vía tmp + os.replace."""
+    global _SUBS_SAVED
+    snapshot = frozenset(subs)
+    if snapshot == _SUBS_SAVED:
+        return
+    tmp = SUBS_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.writelines(f"{cid}\n" for cid in sorted(snapshot))
+    os.replace(tmp, SUBS_FILE)
+    _SUBS_SAVED = snapshot
+
+def add_sub(cid: int) -> None:
+    """Alta O(1): agrega una línea al final, sin reescribir todo el archivo."""
+    global _SUBS_SAVED
+    if cid in SUBS:
+        return
+    SUBS.add(cid)
+    if not os.path.exists(SUBS_FILE):
+        # Primera escritura: volcado completo para no perder lo ya cargado
+        save_subs(SUBS)
+        return
+    with open(SUBS_FILE, "a", encoding="utf-8") as f:
+        f.write(f"{cid}\n")
+    _SUBS_SAVED = frozenset(SUBS)
 
 SUBS = load_subs()
+_SUBS_SAVED = frozenset(SUBS)
 
 # ---------------- UI (botones) ---------------- #
 def menu_markup(is_subscribed: bool) -> InlineKeyboardMarkup:
@@ -66,13 +111,26 @@ def menu_markup(is_subscribed: bool) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(buttons)
 
 # ---------------- Helpers asíncronos ---------------- #
+# Cache del snapshot con TTL: /dolar, "Pedir ahora" y el broadcast comparten
+# un mismo scrape. El lock hace que llamadas concurrentes esperen al que ya
+# está scrapeando en vez de disparar scrapes propios.
+SNAP_TTL = 90  # segundos
+_SNAP = {"ts": 0.0, "text": ""}
+_SNAP_LOCK = asyncio.Lock()
+
 async def get_snapshot_text() -> str:
     """
-    Ejecuta el scraping en un thread para no bloquear el loop async del bot.
+    Devuelve el resumen de cotizaciones, scrapeando a lo sumo una vez
+    cada SNAP_TTL segundos. El scraping es async (aiohttp) y corre sobre
+    el mismo loop del bot, sin thread de por medio.
     """
-    loop = asyncio.get_running_loop()
-    data = await loop.run_in_executor(None, scrape_all)
-    return build_summary_message(data)
+    async with _SNAP_LOCK:
+        if time.monotonic() - _SNAP["ts"] < SNAP_TTL and _SNAP["text"]:
+            return _SNAP["text"]
+        data = await scrape_all_async()
+        _SNAP["text"] = build_summary_message(data)
+        _SNAP["ts"] = time.monotonic()
+        return _SNAP["text"]
 
 # ---------------- Handlers ---------------- #
 async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -101,15 +159,20 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.answer()
     cid = query.message.chat_id
 
+    # Las escrituras a disco van al executor: un toque de botón no debe
+    # frenar el event loop mientras se persiste la lista
+    loop = asyncio.get_running_loop()
+
     if query.data == "sub":
-        SUBS.add(cid); save_subs(SUBS)
+        await loop.run_in_executor(None, add_sub, cid)
         await query.edit_message_text(
             "✅ Quedaste **suscrito**. Te envío el estado cada 10 minutos.\n"
             "También podés usar /dolar cuando quieras.",
             reply_markup=menu_markup(True),
         )
     elif query.data == "unsub":
-        SUBS.discard(cid); save_subs(SUBS)
+        SUBS.discard(cid)
+        await loop.run_in_executor(None, save_subs, frozenset(SUBS))
         await query.edit_message_text(
             "✅ Te **desuscribiste**. No te enviaré más actualizaciones automáticas.\n"
             "Podés volver a suscribirte desde /menu.",
@@ -123,6 +186,10 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await query.message.reply_text(f"❌ Error: {e}")
 
 # ---------------- Job cada 10 minutos ---------------- #
+# Cota de envíos en vuelo durante el broadcast; el ritmo real lo marca
+# el AIORateLimiter global (25 msg/s) configurado en el ApplicationBuilder.
+BROADCAST_SEM = asyncio.BoundedSemaphore(30)
+
 async def job_broadcast(context: ContextTypes.DEFAULT_TYPE):
     if not SUBS:
         return
@@ -132,16 +199,29 @@ async def job_broadcast(context: ContextTypes.DEFAULT_TYPE):
         print(f"[job] Error scrapeando: {e}")
         return
 
-    for chat_id in list(SUBS):
-        try:
-            await context.bot.send_message(chat_id=chat_id, text=text)
-        except Exception as e:
-            print(f"[job] Error enviando a {chat_id}: {e}")
+    async def _send(chat_id: int):
+        async with BROADCAST_SEM:
+            try:
+                await context.bot.send_message(chat_id=chat_id, text=text)
+            except Exception as e:
+                print(f"[job] Error enviando a {chat_id}: {e}")
+
+    # Envíos concurrentes (acotados por el semáforo) en vez de N round-trips seriales
+    await asyncio.gather(*(_send(c) for c in list(SUBS)), return_exceptions=True)
 
 # ---------------- Main ---------------- #
 if __name__ == "__main__":
     TOKEN = os.getenv("TELEGRAM_BOT_TOKEN") or "PON_AQUI_TU_TOKEN"
-    app = ApplicationBuilder().token(TOKEN).build()
+    app = (
+        ApplicationBuilder()
+        .token(TOKEN)
+        # 25 msg/s globales (margen sobre el límite de 30 de Telegram):
+        # evita los 429 + retries que serializan el broadcast
+        .rate_limiter(AIORateLimiter(overall_max_rate=25, overall_time_period=1))
+        .post_init(start_health_server)
+        .post_shutdown(close_http_session)
+        .build()
+    )
 
     # Comandos
     app.add_handler(CommandHandler("start", cmd_start))
@@ -155,5 +235,6 @@ if __name__ == "__main__":
     app.job_queue.run_repeating(job_broadcast, interval=600, first=30)
 
     print("🤖 Bot en vivo. Usá /start o /menu para suscribirte.")
-    print("ℹ️ Recordá haber corrido al menos una vez:  python -m playwright install chromium")
+    if os.getenv("USE_PLAYWRIGHT"):
+        print("ℹ️ Fallback Playwright activo. Recordá haber corrido:  python -m playwright install chromium")
     app.run_polling()
@@ -2,359 +2,617 @@ import os
 import re
 import json
 import time
-import requests
-from bs4 import BeautifulSoup
+import atexit
+import asyncio
+import threading
+
+try:
+    import orjson  # parse/dump varias veces más rápido que el json stdlib
+except ImportError:
+    orjson = None
+import aiohttp
+from telegram import Bot, LinkPreviewOptions
+from telegram.constants import ParseMode
+from selectolax.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 from typing import Dict, Tuple, Any, Optional
 
-# --------- Playwright (para FinanzasArgy) ----------
-from playwright.sync_api import sync_playwright
-
 # ========= Config =========
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
-    "Accept-Language": "es-AR,es;q=0.9"
+    "Accept-Language": "es-AR,es;q=0.9",
+    "Accept-Encoding": "br, gzip, deflate",
 }
 TZ_BA = ZoneInfo("America/Argentina/Buenos_Aires")
 CACHE_FILE = "scraped_prices.json"
+FA_URL = "https://www.finanzasargy.com/"
+# Playwright quedó como fallback opcional (lento: levanta un Chromium entero).
+# Activar con USE_PLAYWRIGHT=1 si el HTML directo deja de servir los precios.
+USE_PLAYWRIGHT = bool(os.getenv("USE_PLAYWRIGHT"))
 MIN_CHANGE = float(os.getenv("MIN_CHANGE_PESOS") or 5.0)  # pesos ARS
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
+# Bot de Telegram propio para el camino standalone (GitHub Actions).
+# Reusa el pool httpx de PTB en vez de abrir otra conexión por mensaje.
+_BOT: Optional[Bot] = None
+
+def _get_bot() -> Bot:
+    global _BOT
+    if _BOT is None:
+        _BOT = Bot(TELEGRAM_BOT_TOKEN)
+    return _BOT
+
+# Sesión aiohttp para los scrapers async: se crea perezosamente sobre el
+# loop activo (en el bot, el mismo loop de PTB; standalone, el de asyncio.run)
+_AIO_SESSION: Optional[aiohttp.ClientSession] = None
+
+async def _get_aio_session() -> aiohttp.ClientSession:
+    global _AIO_SESSION
+    if _AIO_SESSION is None or _AIO_SESSION.closed:
+        _AIO_SESSION = aiohttp.ClientSession(
+            headers=HEADERS,
+            timeout=aiohttp.ClientTimeout(total=25),
+            connector=aiohttp.TCPConnector(limit_per_host=8, ttl_dns_cache=300),
+        )
+    return _AIO_SESSION
+
+async def close_aio_session() -> None:
+    global _AIO_SESSION
+    if _AIO_SESSION is not None and not _AIO_SESSION.closed:
+        await _AIO_SESSION.close()
+    _AIO_SESSION = None
+
+# ========= Regexes precompiladas (hot path del scrape) =========
+_RE_NUM        = re.compile(r"[0-9]+(?:\.[0-9]+)?")
+_RE_AMOUNT     = re.compile(r"\$\s*[\d\.\,]+")
+_RE_HAS_DIGIT  = re.compile(r"\d")
+_RE_AMOUNT_P   = re.compile(r"\$\s*\d")
+_RE_BLUE       = re.compile(r"d[oó]lar\s+blue", re.I)
+_RE_OFICIAL    = re.compile(r"d[oó]lar\s+oficial", re.I)
+_RE_MEP        = re.compile(r"\bMEP\b|bolsa", re.I)
+
 # ========= Helpers =========
+# Tablas para normalizar montos en una sola pasada C de str.translate:
+# saca '$', espacios y puntos de miles, y convierte la coma decimal en punto
+_ARS_TRANS = str.maketrans({"$": None, " ": None, "\xa0": None, ".": None, ",": "."})
+_DROP_COMMA = str.maketrans("", "", ",")
+
 def to_float_ars(txt: str) -> float:
     """Convierte '$ 1.345,00' o '$1320' a float."""
-    t = txt.strip().replace("$", "").replace(" ", "")
-    t = t.replace(".", "").replace(",", ".")
-    m = re.search(r"[0-9]+(?:\.[0-9]+)?", t)
+    t = txt.strip().translate(_ARS_TRANS)
+    m = _RE_NUM.search(t)
     if not m:
         raise ValueError(f"No pude convertir a número: '{txt}'")
     return float(m.group(0))
 
 def fmt_dot(x: float) -> str:
     """$1234.56"""
-    return f"${x:,.2f}".replace(",", "")
+    return f"${x:,.2f}".translate(_DROP_COMMA)
+
+@lru_cache(maxsize=1)
+def _fmt_ba(ts: int) -> str:
+    return datetime.fromtimestamp(ts, TZ_BA).strftime("%d/%m/%Y %H:%M:%S")
 
 def now_ba_str() -> str:
-    return datetime.now(TZ_BA).strftime("%d/%m/%Y %H:%M:%S")
+    # Cacheado por segundo: varios mensajes del mismo tick comparten el formateo
+    return _fmt_ba(int(time.time()))
 
-def load_cache() -> Dict[str, Any]:
+# Cache parseado en memoria: el archivo se lee una sola vez por proceso
+_CACHE: Optional[Dict[str, Any]] = None
+
+def _read_cache_disk() -> Dict[str, Any]:
     if os.path.exists(CACHE_FILE):
         try:
-            with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(CACHE_FILE, "rb") as f:
+                raw = f.read()
+            return orjson.loads(raw) if orjson else json.loads(raw)
         except Exception:
             return {}
     return {}
 
-def save_cache(prices: Dict[str, Any]) -> None:
+def load_cache() -> Dict[str, Any]:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = _read_cache_disk()
+    return _CACHE
+
+# Validadores HTTP (ETag / Last-Modified) vistos en esta corrida; se
+# persisten junto con los precios en save_cache
+_VALIDATORS: Dict[str, Dict[str, Optional[str]]] = {}
+
+async def _fetch_page(name: str, url: str) -> Optional[bytes]:
+    """
+    GET condicional: manda If-None-Match / If-Modified-Since de la corrida
+    anterior. Devuelve el body, o None si el server contestó 304 (página
+    sin cambios: el caller reusa los precios cacheados sin parsear nada).
+    """
+    headers = {}
+    vals = load_cache().get("validators", {}).get(name) or {}
+    if vals.get("etag"):
+        headers["If-None-Match"] = vals["etag"]
+    if vals.get("last_modified"):
+        headers["If-Modified-Since"] = vals["last_modified"]
+
+    session = await _get_aio_session()
+    async with session.get(url, headers=headers) as r:
+        if r.status == 304:
+            return None
+        r.raise_for_status()
+        body = await r.read()
+        etag = r.headers.get("ETag")
+        last_mod = r.headers.get("Last-Modified")
+        if etag or last_mod:
+            _VALIDATORS[name] = {"etag": etag, "last_modified": last_mod}
+        return body
+
+def save_cache(prices: Dict[str, Any], ts_iso: Optional[str] = None) -> None:
+    global _CACHE
+    last = load_cache()
+    validators = {**last.get("validators", {}), **_VALIDATORS}
+    # Caso común: ni precios ni validadores se movieron -> no tocamos el disco
+    if last.get("prices") == prices and last.get("validators", {}) == validators:
+        return
     data = {
-        "timestamp": datetime.now(TZ_BA).isoformat(),
+        "timestamp": ts_iso or datetime.now(TZ_BA).isoformat(),
         "prices": prices,
+        "validators": validators,
     }
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Escritura atómica: tmp + os.replace para no dejar un JSON a medias
+    tmp = CACHE_FILE + ".tmp"
+    if orjson:
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(data))
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, CACHE_FILE)
+    _CACHE = data
 
-def send_telegram(text: str) -> bool:
+async def send_telegram(text: str, bot: Optional[Bot] = None) -> bool:
     if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
         print("❌ Faltan TELEGRAM_BOT_TOKEN / TELEGRAM_CHAT_ID")
         return False
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": TELEGRAM_CHAT_ID,
-        "text": text,
-        "parse_mode": "HTML",
-        "disable_web_page_preview": True,
-    }
     try:
-        r = requests.post(url, data=payload, timeout=20)
-        ok = r.status_code == 200
-        print("✅ Telegram OK" if ok else f"❌ Telegram {r.status_code}: {r.text[:200]}")
-        return ok
+        if bot is None:
+            bot = _get_bot()
+        await bot.send_message(
+            chat_id=TELEGRAM_CHAT_ID,
+            text=text,
+            parse_mode=ParseMode.HTML,
+            link_preview_options=LinkPreviewOptions(is_disabled=True),
+        )
+        print("✅ Telegram OK")
+        return True
     except Exception as e:
         print(f"❌ Telegram error: {e}")
         return False
 
 # ========= Scrapers =========
-def dh_blue_compra_venta() -> Tuple[float, float]:
-    """DolarHoy Blue (compra, venta). HTML estático."""
-    url = "https://dolarhoy.com/"
-    r = requests.get(url, headers=HEADERS, timeout=25)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "lxml")
-
-    anchor = soup.find("a", href="/cotizaciondolarblue")
+async def dh_blue_compra_venta() -> Tuple[float, float]:
+    """DolarHoy Blue (compra, venta). HTML estático, parseado con selectolax."""
+    body = await _fetch_page("dolarhoy", "https://dolarhoy.com/")
+    if body is None:
+        # 304: la página no cambió, reusamos el último valor cacheado
+        prev = load_cache().get("prices", {}).get("Blue_DH")
+        if prev:
+            return prev["compra"], prev["venta"]
+        raise RuntimeError("DolarHoy devolvió 304 pero no hay precios en cache.")
+
+    # Parseamos los bytes directo: lexbor detecta el charset solo,
+    # sin pagar la detección + decode a str de r.text()
+    tree = HTMLParser(body)
+
+    anchor = tree.css_first('a[href="/cotizaciondolarblue"]')
     if not anchor:
         raise RuntimeError("No encontré la sección de Dólar Blue en DolarHoy.")
 
-    compra_div = anchor.find_next("div", class_="compra")
-    venta_div  = anchor.find_next("div", class_="venta")
-    if not compra_div or not venta_div:
-        raise RuntimeError("No encontré bloques compra/venta en DolarHoy.")
-
-    compra_val = compra_div.find("div", class_="val")
-    venta_val  = venta_div.find("div", class_="val")
-    if not compra_val or not venta_val:
-        raise RuntimeError("No encontré valores compra/venta en DolarHoy.")
-
-    compra = to_float_ars(compra_val.get_text())
-    venta  = to_float_ars(venta_val.get_text())
+    # Subimos desde el anchor hasta la tarjeta que contiene ambos valores.
+    # Un solo selector agrupado por ancestro (css devuelve orden de documento:
+    # compra primero, venta después) en vez de dos recorridos separados.
+    node = anchor.parent
+    while node is not None:
+        vals = node.css("div.compra div.val, div.venta div.val")
+        if len(vals) >= 2:
+            return to_float_ars(vals[0].text()), to_float_ars(vals[1].text())
+        node = node.parent
+
+    raise RuntimeError("No encontré valores compra/venta en DolarHoy.")
+
+def _fa_extract_text_numbers(card_text: str) -> list:
+    """Devuelve los importes '$...' de un texto de tarjeta como floats."""
+    nums = _RE_AMOUNT.findall(card_text)
+    return [to_float_ars(n) for n in nums if _RE_HAS_DIGIT.search(n)]
+
+# Tipos de tarjeta FA que buscamos, con su patrón precompilado
+_FA_CARDS = (
+    ("blue",    _RE_BLUE),
+    ("oficial", _RE_OFICIAL),
+    ("mep",     _RE_MEP),
+)
+
+def _fa_scan_cards(soup) -> Dict[str, list]:
+    """
+    Una sola pasada por los <section> de FA: clasifica cada tarjeta contra
+    los patrones Blue/Oficial/MEP y devuelve {tipo: importes}. La primera
+    tarjeta con importes de cada tipo gana; corta al completar los tres.
+    """
+    found: Dict[str, list] = {}
+    for section in soup.find_all("section"):
+        text = section.get_text(" ", strip=True)
+        for key, rx in _FA_CARDS:
+            if key in found or not rx.search(text):
+                continue
+            nums = _fa_extract_text_numbers(text)
+            if nums:
+                found[key] = nums
+        if len(found) == len(_FA_CARDS):
+            break
+    return found
+
+def _fa_compra_venta(nums: list) -> Tuple[float, float]:
+    """En tarjeta FA: VENTA primero / COMPRA segundo. Si hay solo 1, se replica."""
+    if len(nums) >= 2:
+        venta, compra = nums[0], nums[1]
+    else:
+        venta = nums[0]; compra = venta
     return compra, venta
 
-def _fa_extract_card_numbers(page, pattern: str) -> list:
+def _fa_pack(c_b, v_b, c_o, v_o, p_mep) -> Dict[str, Dict[str, float]]:
+    """Arma el dict Blue_FA / Oficial_FA / MEP_FA (MEP: compra=venta=precio)."""
+    return {
+        "Blue_FA": {
+            "compra": c_b,
+            "venta": v_b,
+            "promedio": (c_b + v_b) / 2.0
+        },
+        "Oficial_FA": {
+            "compra": c_o,
+            "venta": v_o,
+            "promedio": (c_o + v_o) / 2.0
+        },
+        "MEP_FA": {
+            "compra": p_mep,
+            "venta": p_mep,
+            "promedio": p_mep
+        },
+    }
+
+async def _scrape_finanzas_argy_http() -> Dict[str, Dict[str, float]]:
     """
-    Devuelve importes '$...' como floats dentro del primer <section>
-    que contenga 'pattern' (regex, case-insensitive). Si falla, intenta fallback
-    a cualquier <p> con '$' visible (como en el modal).
+    FA vía HTTP + BeautifulSoup (sin browser): un GET y
+    extraemos Blue / Oficial / MEP de las tarjetas <section>.
     """
-    locator = page.locator("section", has_text=re.compile(pattern, re.I)).first
+    # Import diferido: el bot no paga bs4 al arrancar, solo en el primer scrape
+    from bs4 import BeautifulSoup
+
+    body = await _fetch_page("finanzasargy", FA_URL)
+    if body is None:
+        # 304: reusamos las tres entradas FA cacheadas
+        prev = load_cache().get("prices", {})
+        cached = {k: prev[k] for k in ("Blue_FA", "Oficial_FA", "MEP_FA") if k in prev}
+        if cached:
+            return cached
+        raise RuntimeError("FinanzasArgy devolvió 304 pero no hay precios en cache.")
+
+    soup = BeautifulSoup(body, "lxml")
+
+    cards = _fa_scan_cards(soup)
+    for key, rx in _FA_CARDS:
+        if key not in cards:
+            raise RuntimeError(f"No encontré tarjeta con patrón: {rx.pattern}")
+
+    c_b, v_b = _fa_compra_venta(cards["blue"])
+    c_o, v_o = _fa_compra_venta(cards["oficial"])
+    return _fa_pack(c_b, v_b, c_o, v_o, cards["mep"][0])
+
+def _fa_extract_card_numbers(page, rx: re.Pattern) -> list:
+    """
+    (Fallback Playwright) Importes '$...' dentro del primer <section> que
+    matchee 'rx'. Si falla, intenta cualquier <p> con '$' visible.
+    """
+    locator = page.locator("section", has_text=rx).first
     if locator.count() == 0:
-        raise RuntimeError(f"No encontré tarjeta con patrón: {pattern}")
+        raise RuntimeError(f"No encontré tarjeta con patrón: {rx.pattern}")
 
     card_text = locator.inner_text(timeout=10000)
-    nums = re.findall(r"\$\s*[\d\.\,]+", card_text)
-    nums = [to_float_ars(n) for n in nums if re.search(r"\d", n)]
+    nums = _fa_extract_text_numbers(card_text)
     if nums:
         return nums
 
-    p_all = page.locator("p", has_text=re.compile(r"\$\s*\d"))
+    p_all = page.locator("p", has_text=_RE_AMOUNT_P)
     if p_all.count() > 0:
         return [to_float_ars(p_all.first.inner_text())]
 
-    raise RuntimeError(f"No pude extraer importes en tarjeta con patrón: {pattern}")
-
-def fa_blue_compra_venta(page) -> Tuple[float, float]:
-    """FinanzasArgy Blue (compra, venta). En tarjeta: VENTA primero / COMPRA segundo."""
-    nums = _fa_extract_card_numbers(page, r"d[oó]lar\s+blue")
-    if len(nums) >= 2:
-        venta, compra = nums[0], nums[1]
-    else:
-        venta = nums[0]; compra = venta
-    return compra, venta
+    raise RuntimeError(f"No pude extraer importes en tarjeta con patrón: {rx.pattern}")
 
-def fa_oficial_compra_venta(page) -> Tuple[float, float]:
-    """FinanzasArgy Oficial (compra, venta). Si hay solo 1, se replica."""
-    nums = _fa_extract_card_numbers(page, r"d[oó]lar\s+oficial")
-    if len(nums) >= 2:
-        venta, compra = nums[0], nums[1]
+def _block_heavy_resources(route):
+    """Aborta imágenes/fuentes/CSS/media: solo nos interesa el texto de las tarjetas."""
+    if route.request.resource_type in {"image", "font", "media", "stylesheet"}:
+        route.abort()
     else:
-        venta = nums[0]; compra = venta
-    return compra, venta
-
-def fa_mep_precio(page) -> float:
-    """FinanzasArgy MEP (precio único). Si hay 2, devuelve el primero."""
-    nums = _fa_extract_card_numbers(page, r"\bMEP\b|bolsa")
-    return nums[0] if nums else None
-
-def scrape_finanzas_argy() -> Dict[str, Dict[str, float]]:
+        route.continue_()
+
+# Browser compartido entre ticks (fallback): lanzar Chromium cuesta ~1-2s,
+# lo amortizamos manteniendo un solo proceso vivo.
+# Playwright sync es afín al thread que lo creó (greenlets): TODO el camino
+# fallback corre en este executor de un único thread, nunca en el pool default
+_PW = None
+_PW_BROWSER = None
+_PW_LOCK = threading.Lock()
+_PW_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="playwright")
+
+def _close_browser() -> None:
+    global _PW, _PW_BROWSER
+    with _PW_LOCK:
+        if _PW_BROWSER is not None:
+            try:
+                _PW_BROWSER.close()
+            except Exception:
+                pass
+            _PW_BROWSER = None
+        if _PW is not None:
+            try:
+                _PW.stop()
+            except Exception:
+                pass
+            _PW = None
+
+def _shutdown_playwright() -> None:
+    """Cierra el browser desde su propio thread al terminar el proceso."""
+    try:
+        _PW_EXECUTOR.submit(_close_browser).result(timeout=10)
+    except Exception:
+        # Executor ya apagado: intento directo (los errores se tragan adentro)
+        _close_browser()
+
+atexit.register(_shutdown_playwright)
+
+def _get_browser():
+    """Devuelve el Chromium compartido, relanzándolo si se desconectó."""
+    global _PW, _PW_BROWSER
+    from playwright.sync_api import sync_playwright
+
+    with _PW_LOCK:
+        if _PW_BROWSER is None or not _PW_BROWSER.is_connected():
+            _PW = sync_playwright().start()
+            _PW_BROWSER = _PW.chromium.launch(
+                headless=True,
+                args=["--no-sandbox", "--disable-dev-shm-usage"],
+            )
+        return _PW_BROWSER
+
+def _scrape_finanzas_argy_playwright() -> Dict[str, Dict[str, float]]:
+    """(Fallback) Extrae las tarjetas de FA con el Chromium compartido."""
+    context = _get_browser().new_context(extra_http_headers=HEADERS)
+    try:
+        page = context.new_page()
+        page.route("**/*", _block_heavy_resources)
+        # Esperar la tarjeta concreta en vez de 'networkidle': arrancamos a
+        # parsear apenas aparece el Blue, sin la ventana de tráfico quieto
+        page.goto(FA_URL, wait_until="domcontentloaded", timeout=30000)
+        page.locator("section", has_text=_RE_BLUE).first.wait_for(state="visible", timeout=15000)
+
+        c_b, v_b = _fa_compra_venta(_fa_extract_card_numbers(page, _RE_BLUE))
+        c_o, v_o = _fa_compra_venta(_fa_extract_card_numbers(page, _RE_OFICIAL))
+        nums_mep = _fa_extract_card_numbers(page, _RE_MEP)
+    finally:
+        context.close()
+    return _fa_pack(c_b, v_b, c_o, v_o, nums_mep[0])
+
+async def scrape_finanzas_argy() -> Dict[str, Dict[str, float]]:
     """
-    Abre FA una sola vez y extrae:
+    Extrae de FinanzasArgy:
       - Blue (compra, venta)
       - Oficial (compra, venta)
       - MEP (precio)  -> guardamos como compra=venta=precio
     """
-    out: Dict[str, Dict[str, float]] = {}
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.set_extra_http_headers(HEADERS)
-        page.goto("https://www.finanzasargy.com/", wait_until="networkidle", timeout=60000)
-
-        # Blue
-        c_b, v_b = fa_blue_compra_venta(page)
-        out["Blue_FA"] = {
-            "compra": c_b,
-            "venta": v_b,
-            "promedio": (c_b + v_b) / 2.0
-        }
-
-        # Oficial
-        c_o, v_o = fa_oficial_compra_venta(page)
-        out["Oficial_FA"] = {
-            "compra": c_o,
-            "venta": v_o,
-            "promedio": (c_o + v_o) / 2.0
-        }
-
-        # MEP (precio único)
-        p_mep = fa_mep_precio(page)
-        out["MEP_FA"] = {
-            "compra": p_mep,
-            "venta": p_mep,
-            "promedio": p_mep
-        }
-
-        browser.close()
-    return out
-
-def scrape_all() -> Dict[str, Dict[str, float]]:
-    """Orquestador: DolarHoy + FinanzasArgy."""
+    if USE_PLAYWRIGHT:
+        # sync_playwright no puede correr sobre el loop, y el browser es afín
+        # a su thread: siempre al executor dedicado de un solo thread
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_PW_EXECUTOR, _scrape_finanzas_argy_playwright)
+    return await _scrape_finanzas_argy_http()
+
+async def scrape_all_async() -> Dict[str, Dict[str, float]]:
+    """Orquestador: DolarHoy + FinanzasArgy, en paralelo sobre el mismo loop."""
     data: Dict[str, Dict[str, float]] = {}
 
+    res_dh, res_fa = await asyncio.gather(
+        dh_blue_compra_venta(),
+        scrape_finanzas_argy(),
+        return_exceptions=True,
+    )
+
     # DolarHoy Blue
-    try:
-        c_dh, v_dh = dh_blue_compra_venta()
+    if isinstance(res_dh, BaseException):
+        print(f"❌ DolarHoy error: {res_dh}")
+    else:
+        c_dh, v_dh = res_dh
         data["Blue_DH"] = {
             "compra": c_dh,
             "venta": v_dh,
             "promedio": (c_dh + v_dh) / 2.0
         }
-    except Exception as e:
-        print(f"❌ DolarHoy error: {e}")
 
     # FinanzasArgy
-    try:
-        fa = scrape_finanzas_argy()
-        data.update(fa)
-    except Exception as e:
-        print(f"❌ FinanzasArgy error: {e}")
+    if isinstance(res_fa, BaseException):
+        print(f"❌ FinanzasArgy error: {res_fa}")
+    else:
+        data.update(res_fa)
 
     return data
 
+async def _scrape_all_oneshot() -> Dict[str, Dict[str, float]]:
+    """scrape_all_async + cierre de la sesión (para corridas one-shot)."""
+    try:
+        return await scrape_all_async()
+    finally:
+        await close_aio_session()
+
+def scrape_all() -> Dict[str, Dict[str, float]]:
+    """Wrapper sincrónico para el script standalone (GitHub Actions)."""
+    return asyncio.run(_scrape_all_oneshot())
+
 # ========= Mensajes =========
-def build_summary_message(data: Dict[str, Dict[str, float]]) -> str:
+# Filas compra/venta del resumen, en el orden pedido por Nico
+_SUMMARY_ROWS = (
+    ("Blue_DH",    "💙 DolarHoy Blue"),
+    ("Blue_FA",    "📈 Finanzas Argy Blue"),
+    ("Oficial_FA", "🏛️ Finanzas Argy Oficial"),
+)
+
+def build_summary_message(data: Dict[str, Dict[str, float]],
+                          stamp: Optional[str] = None) -> str:
     """
     Mensaje de inicio/resumen con el formato pedido por Nico.
+    'stamp' permite fijar la hora desde afuera (un solo timestamp por corrida).
     """
-    lines = []
-
-    # 💙 DolarHoy Blue
-    if "Blue_DH" in data:
-        v = data["Blue_DH"]
-        lines.append(f"💙 DolarHoy Blue → COMPRA: {fmt_dot(v['compra'])} | VENTA: {fmt_dot(v['venta'])}")
-
-    # 📈 Finanzas Argy Blue
-    if "Blue_FA" in data:
-        v = data["Blue_FA"]
-        lines.append(f"📈 Finanzas Argy Blue → COMPRA: {fmt_dot(v['compra'])} | VENTA: {fmt_dot(v['venta'])}")
-
-    # 🏛️ Finanzas Argy Oficial
-    if "Oficial_FA" in data:
-        v = data["Oficial_FA"]
-        lines.append(f"🏛️ Finanzas Argy Oficial → COMPRA: {fmt_dot(v['compra'])} | VENTA: {fmt_dot(v['venta'])}")
-
-    # 📈 Finanzas Argy MEP
-    if "MEP_FA" in data:
-        v = data["MEP_FA"]
+    lines = [
+        f"{label} → COMPRA: {fmt_dot(v['compra'])} | VENTA: {fmt_dot(v['venta'])}"
+        for key, label in _SUMMARY_ROWS
+        if (v := data.get(key))
+    ]
+
+    # 📈 Finanzas Argy MEP (precio único)
+    v = data.get("MEP_FA")
+    if v:
         lines.append(f"📈 Finanzas Argy MEP → PRECIO: {fmt_dot(v['venta'])}")
 
     # Hora BA
     lines.append("")
-    lines.append(f"🕐 Enviado: {now_ba_str()}")
+    lines.append(f"🕐 Enviado: {stamp or now_ba_str()}")
 
     return "\n".join(lines).strip()
 
-def build_changes_message(changes: Dict[str, Dict[str, float]]) -> str:
+# Emoji y etiqueta por fuente, y template del bloque de cambio (constantes
+# de módulo: antes se reconstruían los dicts en cada llamada)
+_CHANGE_META = {
+    "Blue_DH":    ("💙", "DolarHoy Blue (VENTA)"),
+    "Blue_FA":    ("📈", "Finanzas Argy Blue (VENTA)"),
+    "Oficial_FA": ("🏛️", "Finanzas Argy Oficial (VENTA)"),
+    "MEP_FA":     ("📈", "Finanzas Argy MEP"),
+}
+_CHANGE_TMPL = (
+    "{emoji} <b>{label}</b>\n"
+    "💰 {old} → {new}\n"
+    "📊 Cambio: {delta} ({pct:+.2f}%)\n"
+)
+
+def build_changes_message(changes: Dict[str, Dict[str, float]],
+                          stamp: Optional[str] = None) -> str:
     """
     Mensaje de cambios detectados (≥ MIN_CHANGE).
     Mostramos del/ al y el delta.
     """
-    title = "🚨 <b>CAMBIOS EN COTIZACIONES</b>\n"
-    parts = [title]
-
-    emoji = {
-        "Blue_DH": "💙",
-        "Blue_FA": "📈",
-        "Oficial_FA": "🏛️",
-        "MEP_FA": "📈",
-    }
+    parts = ["🚨 <b>CAMBIOS EN COTIZACIONES</b>\n"]
 
     for k, d in changes.items():
-        e = emoji.get(k, "💰")
+        emoji, label = _CHANGE_META.get(k, ("💰", k))
         old_v = d["old"]
         new_v = d["new"]
         delta = new_v - old_v
         pct = (delta / old_v) * 100 if old_v else 0.0
-        label = {
-            "Blue_DH": "DolarHoy Blue (VENTA)",
-            "Blue_FA": "Finanzas Argy Blue (VENTA)",
-            "Oficial_FA": "Finanzas Argy Oficial (VENTA)",
-            "MEP_FA": "Finanzas Argy MEP",
-        }.get(k, k)
-
-        parts.append(
-            f"{e} <b>{label}</b>\n"
-            f"💰 {fmt_dot(old_v)} → {fmt_dot(new_v)}\n"
-            f"📊 Cambio: {fmt_dot(delta)} ({pct:+.2f}%)\n"
-        )
+        parts.append(_CHANGE_TMPL.format(
+            emoji=emoji, label=label,
+            old=fmt_dot(old_v), new=fmt_dot(new_v),
+            delta=fmt_dot(delta), pct=pct,
+        ))
 
-    parts.append(f"🕐 <i>{now_ba_str()}</i>")
+    parts.append(f"🕐 <i>{stamp or now_ba_str()}</i>")
     return "\n".join(parts)
 
 # ========= Lógica de comparación =========
-def track_and_notify(prices: Dict[str, Dict[str, float]]) -> None:
+# qué campo comparar por fuente:
+#   Blue_DH, Blue_FA, Oficial_FA -> "venta"
+#   MEP_FA -> "venta" (precio único)
+_COMPARE_FIELDS = {
+    "Blue_DH": "venta",
+    "Blue_FA": "venta",
+    "Oficial_FA": "venta",
+    "MEP_FA": "venta",
+}
+
+async def track_and_notify(prices: Dict[str, Dict[str, float]]) -> None:
     """
     Compara contra el último cache y envía:
       - Mensaje de inicio si no hay cache
       - Mensaje de cambios si alguna VENTA (o precio MEP) varió ≥ MIN_CHANGE
     """
+    # Un solo timestamp por corrida: log, mensaje y cache quedan consistentes
+    now = datetime.now(TZ_BA)
+    stamp = now.strftime("%d/%m/%Y %H:%M:%S")
+
     last = load_cache()
     last_prices = last.get("prices", {}) if last else {}
 
-    # qué campo comparar:
-    #   Blue_DH, Blue_FA, Oficial_FA -> "venta"
-    #   MEP_FA -> "venta" (precio único)
-    compare_fields = {
-        "Blue_DH": "venta",
-        "Blue_FA": "venta",
-        "Oficial_FA": "venta",
-        "MEP_FA": "venta",
-    }
-
     changes: Dict[str, Dict[str, float]] = {}
+    field_get = _COMPARE_FIELDS.get
+    last_get = last_prices.get
+    threshold = MIN_CHANGE
     for k, v in prices.items():
-        field = compare_fields.get(k)
+        field = field_get(k)
         if not field:
             continue
 
-        new_val = v.get(field)
-        old_val = last_prices.get(k, {}).get(field)
+        last_entry = last_get(k)
+        if last_entry is None:
+            # primera vez: no marcar como cambio fuerte
+            continue
 
+        old_val = last_entry.get(field)
         if old_val is None:
-            # primera vez: no marcar como cambio fuerte
             continue
 
-        if abs(new_val - old_val) >= MIN_CHANGE:
+        new_val = v.get(field)
+        if abs(new_val - old_val) >= threshold:
             changes[k] = {"old": old_val, "new": new_val}
 
     if not last_prices:
         # Mensaje inicial
-        msg = build_summary_message(prices)
+        msg = build_summary_message(prices, stamp)
         print("\n=== MENSAJE INICIAL ===\n" + msg + "\n=======================")
-        send_telegram(msg)
+        await send_telegram(msg)
     elif changes:
-        msg = build_changes_message(changes)
+        msg = build_changes_message(changes, stamp)
         print("\n=== CAMBIOS DETECTADOS ===\n" + msg + "\n==========================")
-        send_telegram(msg)
+        await send_telegram(msg)
     else:
         print("😴 Sin cambios significativos (≥ ${:.0f})".format(MIN_CHANGE))
 
-    save_cache(prices)
+    save_cache(prices, now.isoformat())
 
 # ========= Main =========
-def main():
+async def main():
     print(f"🔎 Iniciando scrape {now_ba_str()} (umbral: ${MIN_CHANGE:.0f})")
-    data = scrape_all()
+    data = await scrape_all_async()
     if not data:
         print("❌ No se obtuvieron cotizaciones.")
         return
 
     # Siempre enviamos el resumen al ejecutar manualmente (opcional):
-    # send_telegram(build_summary_message(data))
+    # await send_telegram(build_summary_message(data))
 
     # Comparamos y notificamos si corresponde
-    track_and_notify(data)
+    await track_and_notify(data)
 
-if __name__ == "__main__":
+async def _run():
     try:
-        main()
+        await main()
     except Exception as e:
-            print(f"❌ Error fatal: {e}")
-            # Notificar error por Telegram si hay credenciales
-            if TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID:
-                try:
-                    send_telegram(f"❌ <b>Error en Monitor de Dólar</b>\n\n{e}")
-                except Exception:
-                    pass
+        print(f"❌ Error fatal: {e}")
+        # Notificar error por Telegram si hay credenciales
+        if TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID:
+            try:
+                await send_telegram(f"❌ <b>Error en Monitor de Dólar</b>\n\n{e}")
+            except Exception:
+                pass
+    finally:
+        await close_aio_session()
+
+if __name__ == "__main__":
+    asyncio.run(_run())